@@ -2,7 +2,7 @@ import os
 import shutil
 import subprocess
 import time
-from docstringinspector import DocstringInspector
+from CodeInspector import DocstringInspector
 
 # Configuration
 REPO_DIR = "test_repo"
@@ -1,3 +1,4 @@
 from .code_inspector import CodeInspector
+from .docstring_inspector import DocstringInspector
 
-#__all__ = ["CodeInspector"]
\ No newline at end of file
+#__all__ = ["CodeInspector", "DocstringInspector"]
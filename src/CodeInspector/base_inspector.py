@@ -0,0 +1,349 @@
+import ast
+import functools
+import subprocess
+import os
+from collections import OrderedDict
+from typing import List, Tuple, Optional, Dict, Union, Iterator
+
+# Base argv for every `git log -L` call. Rename detection is switched off (both the
+# log option and diff.renames), trading history across file renames for speed.
+_GIT_LOG_CMD = ["git", "-c", "diff.renames=false", "log", "--no-renames", "--no-follow"]
+
+# Parsed files keyed by (absolute path, mtime_ns, size), least recently used first.
+# Values are (source_code, tree, name_index, overload_cache).
+_PARSE_CACHE: "OrderedDict[Tuple[str, int, int], tuple]" = OrderedDict()
+_PARSE_CACHE_SIZE = 128
+
+_DefNode = Union[ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef]
+
+# Statement-list fields of compound statements (Module, def/class, if, for, while, with,
+# try/except handlers, match cases), in reverse source order for the DFS stack below.
+_STMT_LIST_FIELDS = ("finalbody", "orelse", "handlers", "cases", "body")
+
+def _walk_defs(tree: ast.AST) -> Iterator[_DefNode]:
+    """
+    Yields function/class definitions in source order.
+    Only statement bodies are traversed: definitions cannot appear inside
+    expressions, so expression nodes are never visited.
+    """
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            yield node
+        for field in _STMT_LIST_FIELDS:
+            children = getattr(node, field, None)
+            if children:
+                stack.extend(reversed(children))
+
+def _build_name_index(tree: ast.AST) -> Dict[str, List[_DefNode]]:
+    """Maps every function/class name in the tree to its definition nodes."""
+    index: Dict[str, List[_DefNode]] = {}
+    for node in _walk_defs(tree):
+        index.setdefault(node.name, []).append(node)
+    return index
+
+def _memoize_lines(method):
+    """
+    Caches a per-name line-range method on the instance (the parsed tree never changes).
+    Ranges are stored as a tuple and every call gets its own list, so callers can't corrupt the cache.
+    """
+    @functools.wraps(method)
+    def wrapper(self, name: str):
+        key = (method.__name__, name)
+        if key not in self._line_cache:
+            self._line_cache[key] = tuple(method(self, name))
+        return list(self._line_cache[key])
+    return wrapper
+
+def _memoize_history(method):
+    """
+    Caches a per-name git history method for the lifetime of the instance.
+    Like the parsed tree and line ranges, results are not refreshed after the file
+    is edited or new commits are made; create a new inspector to see those.
+    """
+    @functools.wraps(method)
+    def wrapper(self, name: str):
+        key = (method.__name__, name)
+        if key not in self._history_cache:
+            self._history_cache[key] = method(self, name)
+        return self._history_cache[key]
+    return wrapper
+
+class _BaseInspector:
+    """
+    Locates the definition, signature, docstring and body lines of a function/class
+    in a Python file, and fetches their git history.
+    """
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File {file_path} not found.")
+
+        # git runs from the file's directory; resolve the paths once rather than per git call.
+        self._abs_path = os.path.abspath(file_path)
+        self._repo_cwd = os.path.dirname(self._abs_path)
+
+        # Reuse the parse of an unchanged file across instances.
+        st = os.stat(self._abs_path)
+        cache_key = (self._abs_path, st.st_mtime_ns, st.st_size)
+        cached = _PARSE_CACHE.get(cache_key)
+        if cached is not None:
+            _PARSE_CACHE.move_to_end(cache_key)
+            self.source_code, self.tree, self._name_index, self._overload_cache = cached
+        else:
+            with open(file_path, "r", encoding="utf-8") as f:
+                self.source_code = f.read()
+
+            self.tree = ast.parse(self.source_code)
+
+            # Index all definitions by name in a single walk, so lookups don't re-traverse the tree.
+            self._name_index = _build_name_index(self.tree)
+
+            # @overload flags keyed by id(node), computed once for every indexed definition.
+            self._overload_cache: Dict[int, bool] = {
+                id(node): self._has_overload_decorator(node)
+                for nodes in self._name_index.values() for node in nodes
+            }
+
+            _PARSE_CACHE[cache_key] = (self.source_code, self.tree, self._name_index, self._overload_cache)
+            if len(_PARSE_CACHE) > _PARSE_CACHE_SIZE:
+                _PARSE_CACHE.popitem(last=False)
+
+        # (start, end) line ranges keyed by id(node); the tree keeps the nodes alive.
+        self._range_cache: Dict[int, Tuple[int, int]] = {}
+
+        # Lazily populated memos for the per-name line-range and git history queries.
+        self._line_cache: Dict[Tuple[str, str], Tuple[Tuple[int, int], ...]] = {}
+        self._history_cache: Dict[Tuple[str, str], str] = {}
+
+    def _find_nodes(self, name: str) -> List[_DefNode]:
+        """
+        Finds all nodes (definitions) matching the name.
+        This captures the main definition and any @overload definitions.
+        Returns a copy: the index is shared through _PARSE_CACHE by every inspector on the file.
+        """
+        return list(self._name_index.get(name, ()))
+
+    @staticmethod
+    def _has_overload_decorator(node) -> bool:
+        """Checks whether a definition is decorated with @overload (or @typing.overload)."""
+        for dec in getattr(node, 'decorator_list', []):
+            if isinstance(dec, ast.Name) and dec.id == 'overload':
+                return True
+            if isinstance(dec, ast.Attribute) and dec.attr == 'overload':
+                return True
+        return False
+
+    def _is_overload(self, node) -> bool:
+        """Returns the precomputed @overload flag of an indexed definition."""
+        return self._overload_cache[id(node)]
+
+    def _get_node_range(self, node) -> Tuple[int, int]:
+        """Returns the start and end line numbers (1-based) of a node including decorators."""
+        cached = self._range_cache.get(id(node))
+        if cached is not None:
+            return cached
+
+        start_line = node.lineno
+        # If there are decorators, the definition starts at the first decorator
+        if hasattr(node, 'decorator_list') and node.decorator_list:
+            start_line = node.decorator_list[0].lineno
+
+        # end_lineno is available in Python 3.8+
+        end_line = getattr(node, 'end_lineno', node.lineno)
+        self._range_cache[id(node)] = (start_line, end_line)
+        return start_line, end_line
+
+    def _get_docstring_node(self, node) -> Optional[ast.Expr]:
+        """Returns the AST node for the docstring if it exists."""
+        if not hasattr(node, 'body') or not node.body:
+            return None
+
+        # Check if first item in body is an expression containing a string
+        # (ast.Constant since Py 3.8, which end_lineno already requires)
+        first_node = node.body[0]
+        if (isinstance(first_node, ast.Expr) and
+            isinstance(first_node.value, ast.Constant) and
+            isinstance(first_node.value.value, str)):
+            return first_node
+        return None
+
+    def _iter_git_log(self, cmd: List[str]) -> Iterator[str]:
+        """
+        Yields the stdout lines of a git command as git produces them.
+        Raises CalledProcessError (with stderr) if git exits with an error.
+        """
+        with subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, bufsize=1,
+            cwd=self._repo_cwd
+        ) as proc:
+            for line in proc.stdout:
+                yield line.rstrip("\n")
+            stderr = proc.stderr.read()
+
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, cmd, stderr=stderr)
+
+    def _line_range_args(self, line_ranges: List[Tuple[int, int]]) -> List[str]:
+        """Builds `-L <s1>,<e1>:<file> -L <s2>,<e2>:<file> ...`, skipping invalid ranges."""
+        args = []
+        for start, end in line_ranges:
+            if start <= end:
+                args += ["-L", f"{start},{end}:{self._abs_path}"]
+        return args
+
+    def _iter_git_log_L(self, line_ranges: List[Tuple[int, int]], commits: int = 5) -> Iterator[str]:
+        """
+        Streams `git log -L` output for the specific line ranges.
+        All ranges are passed to a single git invocation (one `-L` per range),
+        so git walks the history once instead of once per range.
+        Renames are not followed, so history before a file rename is not shown.
+        """
+        valid_ranges = [(start, end) for start, end in line_ranges if start <= end]
+        if not valid_ranges:
+            yield "No lines found to analyze."
+            return
+
+        cmd = _GIT_LOG_CMD + self._line_range_args(valid_ranges)
+        cmd += [f"--max-count={commits}", "--date=unix"]
+
+        lines_label = ", ".join(f"{start}-{end}" for start, end in valid_ranges)
+        yield f"--- History for lines {lines_label} ---"
+        try:
+            yield from self._iter_git_log(cmd)
+        except subprocess.CalledProcessError as e:
+            yield f"Error reading lines {lines_label}: {e.stderr.strip()}"
+        except Exception as e:
+            yield f"Git execution failed: {str(e)}"
+
+    def _run_git_log_L(self, line_ranges: List[Tuple[int, int]], commits: int = 5) -> str:
+        """
+        Runs `git log -L` for the specific line ranges and returns the whole output.
+        """
+        return "\n".join(self._iter_git_log_L(line_ranges, commits))
+
+    # ---------------------------------------------------------
+    # 1) Find code lines for definition
+    # ---------------------------------------------------------
+    @_memoize_lines
+    def get_definition_lines(self, name: str) -> List[Tuple[int, int]]:
+        """Returns list of (start, end) tuples for all definitions (including overloads)."""
+        nodes = self._find_nodes(name)
+        return [self._get_node_range(n) for n in nodes]
+
+    # ---------------------------------------------------------
+    # 2) Find code lines for function signature (including overloads)
+    # ---------------------------------------------------------
+    @_memoize_lines
+    def get_signature_lines(self, name: str) -> List[Tuple[int, int]]:
+        """
+        Returns line ranges for the signature.
+        Includes full body of @overloads (since they are just signatures)
+        and the header of the actual implementation (decorators + def line).
+        """
+        nodes = self._find_nodes(name)
+        ranges = []
+
+        # This makes a change as a test.
+        for node in nodes:
+            start, end = self._get_node_range(node)
+
+            # check if this is an overload (usually empty body or just ...)
+            if self._is_overload(node):
+                ranges.append((start, end))
+            else:
+                # It's the implementation. Signature ends before the first body statement.
+                if node.body:
+                    sig_end = max(start, node.body[0].lineno - 1)
+                    if node.body[0].lineno == node.lineno:
+                         sig_end = node.lineno
+                    ranges.append((start, sig_end))
+                else:
+                    ranges.append((start, end))
+
+        return ranges
+
+    # ---------------------------------------------------------
+    # 3) Find code lines for the docstring
+    # ---------------------------------------------------------
+    @_memoize_lines
+    def get_docstring_lines(self, name: str) -> List[Tuple[int, int]]:
+        """Returns line ranges of the docstring for the main implementation."""
+        nodes = self._find_nodes(name)
+        ranges = []
+
+        for node in nodes:
+            doc_node = self._get_docstring_node(node)
+            if doc_node:
+                ranges.append((doc_node.lineno, doc_node.end_lineno))
+
+        return ranges
+
+    # ---------------------------------------------------------
+    # 4) Find code lines for everything BUT the docstring
+    # ---------------------------------------------------------
+    @_memoize_lines
+    def get_implementation_without_docstring_lines(self, name: str) -> List[Tuple[int, int]]:
+        """
+        Returns line ranges for the function excluding the docstring.
+        """
+        nodes = self._find_nodes(name)
+        ranges = []
+
+        for node in nodes:
+            start, end = self._get_node_range(node)
+            doc_node = self._get_docstring_node(node)
+
+            if doc_node:
+                if doc_node.lineno > start:
+                    ranges.append((start, doc_node.lineno - 1))
+                if doc_node.end_lineno < end:
+                    ranges.append((doc_node.end_lineno + 1, end))
+            else:
+                ranges.append((start, end))
+
+        return ranges
+
+    # ---------------------------------------------------------
+    # Git Wrappers
+    # ---------------------------------------------------------
+    @_memoize_history
+    def get_git_history_signature(self, name: str) -> str:
+        ranges = self.get_signature_lines(name)
+        return self._run_git_log_L(ranges)
+
+    @_memoize_history
+    def get_git_history_docstring(self, name: str) -> str:
+        ranges = self.get_docstring_lines(name)
+        return self._run_git_log_L(ranges)
+
+    @_memoize_history
+    def get_git_history_body(self, name: str) -> str:
+        ranges = self._get_body_lines(name)
+        return self._run_git_log_L(ranges)
+
+    @_memoize_lines
+    def _get_body_lines(self, name: str) -> List[Tuple[int, int]]:
+        """Returns line ranges of the implementation body (after the docstring), skipping overloads."""
+        nodes = self._find_nodes(name)
+        ranges = []
+
+        for node in nodes:
+            # We ignore overloads here as they are pure signature
+            if self._is_overload(node) or not node.body:
+                continue
+
+            doc_node = self._get_docstring_node(node)
+            func_end = getattr(node, 'end_lineno', node.lineno)
+
+            start_scan = -1
+            if doc_node:
+                start_scan = doc_node.end_lineno + 1
+            else:
+                start_scan = node.body[0].lineno
+
+            if start_scan <= func_end:
+                ranges.append((start_scan, func_end))
+
+        return ranges
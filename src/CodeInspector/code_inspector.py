@@ -1,227 +1,61 @@
-import ast
-import subprocess
+import io
 import os
 import re
-from datetime import datetime
-from typing import Any, List, Tuple, Optional, Dict, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Tuple, Dict, Union, Iterable
 
-class CodeInspector:
-    def __init__(self, file_path: str):
-        self.file_path = file_path
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"File {file_path} not found.")
+from .base_inspector import _BaseInspector, _GIT_LOG_CMD
 
-        with open(file_path, "r", encoding="utf-8") as f:
-            self.source_code = f.read()
-            self.source_lines = self.source_code.splitlines()
+# Upper bound on concurrent git processes for multi-section lookups.
+_MAX_GIT_WORKERS = 8
 
-        self.tree = ast.parse(self.source_code)
-
-    def _find_nodes(self, name: str) -> List[Union[ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef]]:
-        """
-        Finds all nodes (definitions) matching the name.
-        This captures the main definition and any @overload definitions.
-        """
-        matches = []
-        for node in ast.walk(self.tree):
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
-                if node.name == name:
-                    matches.append(node)
-        return matches
-
-    def _get_node_range(self, node) -> Tuple[int, int]:
-        """Returns the start and end line numbers (1-based) of a node including decorators."""
-        start_line = node.lineno
-        # If there are decorators, the definition starts at the first decorator
-        if hasattr(node, 'decorator_list') and node.decorator_list:
-            start_line = node.decorator_list[0].lineno
-
-        # end_lineno is available in Python 3.8+
-        end_line = getattr(node, 'end_lineno', node.lineno)
-        return start_line, end_line
-
-    def _get_docstring_node(self, node) -> Optional[ast.Expr]:
-        """Returns the AST node for the docstring if it exists."""
-        if not hasattr(node, 'body') or not node.body:
-            return None
-
-        # Check if first item in body is an expression containing a string
-        first_node = node.body[0]
-        if (isinstance(first_node, ast.Expr) and
-            isinstance(first_node.value, (ast.Str, ast.Constant))):
-            # In Py 3.8+ ast.Constant is used for strings
-            if isinstance(first_node.value, ast.Constant) and isinstance(first_node.value.value, str):
-                return first_node
-            # Legacy check for older python versions
-            elif isinstance(first_node.value, ast.Str):
-                return first_node
-        return None
-
-    def _run_git_log_L(self, line_ranges: List[Tuple[int, int]], commits: int = 5) -> str:
-        """
-        Runs `git log -L` for the specific line ranges.
-        """
-        if not line_ranges:
-            return "No lines found to analyze."
-
-        output_log = []
-        for start, end in line_ranges:
-            if start > end: continue
-
-            # git log -L <start>,<end>:<file>
-            cmd = [
-                "git", "log",
-                "-L", f"{start},{end}:{self.file_path}",
-                f"--max-count={commits}"
-            ]
-
-            try:
-                result = subprocess.run(
-                    cmd, capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(self.file_path))
-                )
-                if result.returncode != 0:
-                    output_log.append(f"Error reading lines {start}-{end}: {result.stderr.strip()}")
-                else:
-                    output_log.append(f"--- History for lines {start}-{end} ---\n{result.stdout}")
-            except Exception as e:
-                output_log.append(f"Git execution failed: {str(e)}")
-
-        return "\n".join(output_log)
-
-    # ---------------------------------------------------------
-    # 1) Find code lines for definition
-    # ---------------------------------------------------------
-    def get_definition_lines(self, name: str) -> List[Tuple[int, int]]:
-        """Returns list of (start, end) tuples for all definitions (including overloads)."""
-        nodes = self._find_nodes(name)
-        return [self._get_node_range(n) for n in nodes]
-
-    # ---------------------------------------------------------
-    # 2) Find code lines for function signature (including overloads)
-    # ---------------------------------------------------------
-    def get_signature_lines(self, name: str) -> List[Tuple[int, int]]:
+class CodeInspector(_BaseInspector):
+    def _latest_commit_for_ranges(self, line_ranges: List[Tuple[int, int]]) -> Tuple[int, str]:
         """
-        Returns line ranges for the signature.
-        Includes full body of @overloads (since they are just signatures)
-        and the header of the actual implementation (decorators + def line).
+        Returns (unix timestamp, hash) of the latest commit touching the line ranges.
+        Only asks git for the hash and author time (-s skips the diffs).
+        Returns (0, "") if there is no history or git fails.
         """
-        nodes = self._find_nodes(name)
-        ranges = []
-
-        # This makes a change as a test.
-        for node in nodes:
-            start, end = self._get_node_range(node)
-
-            # check if this is an overload (usually empty body or just ...)
-            is_overload = False
-            if hasattr(node, 'decorator_list'):
-                for dec in node.decorator_list:
-                    if isinstance(dec, ast.Name) and dec.id == 'overload':
-                        is_overload = True
-                    elif isinstance(dec, ast.Attribute) and dec.attr == 'overload':
-                        is_overload = True
-
-            if is_overload:
-                ranges.append((start, end))
-            else:
-                # It's the implementation. Signature ends before the first body statement.
-                if node.body:
-                    sig_end = max(start, node.body[0].lineno - 1)
-                    if node.body[0].lineno == node.lineno:
-                         sig_end = node.lineno
-                    ranges.append((start, sig_end))
-                else:
-                    ranges.append((start, end))
-
-        return ranges
-
-    # ---------------------------------------------------------
-    # 3) Find code lines for the docstring
-    # ---------------------------------------------------------
-    def get_docstring_lines(self, name: str) -> List[Tuple[int, int]]:
-        """Returns line ranges of the docstring for the main implementation."""
-        nodes = self._find_nodes(name)
-        ranges = []
+        range_args = self._line_range_args(line_ranges)
+        if not range_args:
+            return 0, ""
 
-        for node in nodes:
-            doc_node = self._get_docstring_node(node)
-            if doc_node:
-                ranges.append((doc_node.lineno, doc_node.end_lineno))
-
-        return ranges
+        cmd = _GIT_LOG_CMD + range_args + ["-s", "--format=%H%x00%at", "--max-count=1"]
+        log_lines = self._iter_git_log(cmd)
+        try:
+            return self._latest_date_from_log(log_lines)
+        except Exception:
+            return 0, ""
+        finally:
+            log_lines.close()
 
-    # ---------------------------------------------------------
-    # 4) Find code lines for everything BUT the docstring
-    # ---------------------------------------------------------
-    def get_implementation_without_docstring_lines(self, name: str) -> List[Tuple[int, int]]:
+    def _latest_date_from_log(self, lines: Iterable[str]) -> Tuple[int, str]:
         """
-        Returns line ranges for the function excluding the docstring.
+        Returns (unix timestamp, hash) of the first (latest) commit in git log output,
+        stopping as soon as it is found instead of parsing the whole log.
+        Understands `--format=%H%x00%at` records and default headers with --date=unix.
+        Returns (0, "") if the log has no commits.
         """
-        nodes = self._find_nodes(name)
-        ranges = []
-
-        for node in nodes:
-            start, end = self._get_node_range(node)
-            doc_node = self._get_docstring_node(node)
-
-            if doc_node:
-                if doc_node.lineno > start:
-                    ranges.append((start, doc_node.lineno - 1))
-                if doc_node.end_lineno < end:
-                    ranges.append((doc_node.end_lineno + 1, end))
-            else:
-                ranges.append((start, end))
-
-        return ranges
-
-    # ---------------------------------------------------------
-    # Git Wrappers
-    # ---------------------------------------------------------
-    def get_git_history_signature(self, name: str) -> str:
-        ranges = self.get_signature_lines(name)
-        return self._run_git_log_L(ranges)
-
-    def get_git_history_docstring(self, name: str) -> str:
-        ranges = self.get_docstring_lines(name)
-        return self._run_git_log_L(ranges)
-
-    def get_git_history_body(self, name: str) -> str:
-        nodes = self._find_nodes(name)
-        ranges = []
-
-        for node in nodes:
-            # We ignore overloads here as they are pure signature
-            is_overload = False
-            if hasattr(node, 'decorator_list'):
-                 for dec in node.decorator_list:
-                    if isinstance(dec, ast.Name) and dec.id == 'overload': is_overload = True
-                    elif isinstance(dec, ast.Attribute) and dec.attr == 'overload': is_overload = True
-
-            if is_overload or not node.body:
-                continue
-
-            doc_node = self._get_docstring_node(node)
-            func_end = getattr(node, 'end_lineno', node.lineno)
-
-            start_scan = -1
-            if doc_node:
-                start_scan = doc_node.end_lineno + 1
-            else:
-                start_scan = node.body[0].lineno
-
-            if start_scan <= func_end:
-                ranges.append((start_scan, func_end))
-
-        return self._run_git_log_L(ranges)
-
-    def parse_git_log_to_dict(self, log_output: str) -> Dict[str, Dict[str, Any]]:
-        """Parses a raw git log string into a dictionary of dictionaries.
+        commit_hash = ""
+        for line in lines:
+            if "\x00" in line:
+                commit_hash, _, timestamp = line.partition("\x00")
+                return int(timestamp), commit_hash
+            if line.startswith("commit "):
+                commit_hash = line[7:47]
+            elif commit_hash and line.startswith("Date:"):
+                date_str = line[5:].strip()
+                return (int(date_str) if date_str.isdigit() else 0), commit_hash
+        return 0, commit_hash
+
+    def parse_git_log_to_dict(self, log_output: Union[str, Iterable[str]]) -> Dict[str, Dict[str, Any]]:
+        """Parses raw git log output (a string or an iterable of lines) into a dictionary of dictionaries.
         Structure:
         {
             "commit_hash": {
                 "author_name": str,
                 "author_email": str,
-                "date": str,
+                "date": int (unix timestamp, from --date=unix),
                 "message": str,
                 "diff": str
             },
@@ -232,58 +66,63 @@ class CodeInspector:
         current_hash = None
         current_data = {}
 
-        commit_pattern = re.compile(r'^commit\s+([0-9a-f]{40})')
-        author_pattern = re.compile(r'^Author:\s+(.+)\s+<(.+)>')
-        date_pattern = re.compile(r'^Date:\s+(.+)')
-        diff_start_pattern = re.compile(r'^diff\s--git')
+        commit_pattern = re.compile(r'^commit ([0-9a-f]{40})')
 
-        lines = log_output.splitlines()
+        lines = log_output.splitlines() if isinstance(log_output, str) else log_output
         state = "HEADER"
 
         for line in lines:
-            commit_match = commit_pattern.match(line)
-            if commit_match:
-                if current_hash and current_data:
-                    current_data['message'] = "\n".join(current_data['message']).strip()
-                    current_data['diff'] = "\n".join(current_data['diff'])
-                    commits[current_hash] = current_data
-
-                current_hash = commit_match.group(1)
-                current_data = {
-                    'author_name': None, 'author_email': None, 'date': None,
-                    'message': [], 'diff': []
-                }
-                state = "HEADER"
+            # Diff bodies make up most of the output, so check them first.
+            # Diff lines never start with "commit " (context lines start with a space).
+            if state == "DIFF" and not line.startswith("commit "):
+                current_data['diff'].write(line)
+                current_data['diff'].write("\n")
                 continue
 
+            # Cheap shape check on "commit <40-char sha>" before confirming the hex with the regex.
+            if line.startswith("commit ") and len(line) >= 47 and line[7:47].isalnum():
+                commit_match = commit_pattern.match(line)
+                if commit_match:
+                    if current_hash and current_data:
+                        current_data['message'] = current_data['message'].getvalue().strip()
+                        # Drop the trailing newline written after the last diff line.
+                        current_data['diff'] = current_data['diff'].getvalue()[:-1]
+                        commits[current_hash] = current_data
+
+                    current_hash = commit_match.group(1)
+                    current_data = {
+                        'author_name': None, 'author_email': None, 'date': None,
+                        'message': io.StringIO(), 'diff': io.StringIO()
+                    }
+                    state = "HEADER"
+                    continue
+
             if current_hash is None: continue
 
             if state == "HEADER":
-                author_match = author_pattern.match(line)
-                if author_match:
-                    current_data['author_name'] = author_match.group(1).strip()
-                    current_data['author_email'] = author_match.group(2).strip()
-                    continue
-
-                date_match = date_pattern.match(line)
-                if date_match:
-                    current_data['date'] = date_match.group(1).strip()
+                if line.startswith("Author:"):
+                    # "Author: Name <email>"
+                    name, _, email = line[7:].rpartition("<")
+                    current_data['author_name'] = name.strip()
+                    current_data['author_email'] = email.rstrip().rstrip(">").strip()
+                elif line.startswith("Date:"):
+                    date_str = line[5:].strip()
+                    # Logs from _iter_git_log_L use --date=unix; keep other formats as-is.
+                    current_data['date'] = int(date_str) if date_str.isdigit() else date_str
                     state = "MESSAGE"
-                    continue
 
             elif state == "MESSAGE":
-                if diff_start_pattern.match(line):
+                if line.startswith("diff --git"):
                     state = "DIFF"
-                    current_data['diff'].append(line)
+                    current_data['diff'].write(line)
+                    current_data['diff'].write("\n")
                     continue
-                current_data['message'].append(line)
-
-            elif state == "DIFF":
-                current_data['diff'].append(line)
+                current_data['message'].write(line)
+                current_data['message'].write("\n")
 
         if current_hash and current_data:
-            current_data['message'] = "\n".join(current_data['message']).strip()
-            current_data['diff'] = "\n".join(current_data['diff'])
+            current_data['message'] = current_data['message'].getvalue().strip()
+            current_data['diff'] = current_data['diff'].getvalue()[:-1]
             commits[current_hash] = current_data
 
         return commits
@@ -292,61 +131,40 @@ class CodeInspector:
     # NEW: Consistency Logic
     # ---------------------------------------------------------
 
-    def _get_latest_commit_info(self, history_dict: Dict[str, Any]) -> Tuple[datetime, str]:
+    def _get_latest_commit_info(self, history_dict: Dict[str, Any]) -> Tuple[int, str]:
         """
-        Extracts the datetime and hash of the latest commit from the parsed log dictionary.
-        Returns (datetime.min, "") if history is empty.
+        Extracts the unix timestamp and hash of the latest commit from the parsed log dictionary.
+        Returns (0, "") if history is empty.
         """
         if not history_dict:
-            return datetime.min.replace(tzinfo=None), ""
+            return 0, ""
 
         # history_dict preserves insertion order (Python 3.7+), and git log returns newest first.
         # So the first key is the latest commit.
         latest_hash = next(iter(history_dict))
-        date_str = history_dict[latest_hash]['date']
+        date = history_dict[latest_hash]['date']
 
-        # Git default date format: "Fri Jan 11 20:23:51 2026 +0100"
-        # We use %z to handle timezone info.
-        try:
-            dt = datetime.strptime(date_str, "%a %b %d %H:%M:%S %Y %z")
-        except ValueError:
-            # Fallback if format differs, though git default is fairly standard.
-            # Using datetime.min ensures this component is treated as "very old"
-            return datetime.min.replace(tzinfo=None), latest_hash
+        if not isinstance(date, int):
+            # Not a --date=unix log; treat this component as "very old".
+            return 0, latest_hash
 
-        return dt, latest_hash
+        return date, latest_hash
 
-    def check_function_consistency(self, name: str) -> List[str]:
+    def _consistency_warnings(self, sig: Tuple[int, str], doc: Tuple[int, str], body: Tuple[int, str]) -> List[str]:
         """
-        Compares the latest Git commits for Signature, Docstring, and Body.
+        Compares the latest (unix timestamp, hash) of the Signature, Docstring, and Body.
         Returns a list of warning notes if inconsistencies are found.
         """
         warnings = []
-
-        # 1. Fetch raw logs
-        raw_sig = self.get_git_history_signature(name)
-        raw_doc = self.get_git_history_docstring(name)
-        raw_body = self.get_git_history_body(name)
-
-        # 2. Parse logs to dictionaries
-        dict_sig = self.parse_git_log_to_dict(raw_sig)
-        dict_doc = self.parse_git_log_to_dict(raw_doc)
-        dict_body = self.parse_git_log_to_dict(raw_body)
-
-        # 3. Get latest dates and hashes
-        # Note: We rely on direct comparison of datetimes (which handles timezone awareness)
-        date_sig, hash_sig = self._get_latest_commit_info(dict_sig)
-        date_doc, hash_doc = self._get_latest_commit_info(dict_doc)
-        date_body, hash_body = self._get_latest_commit_info(dict_body)
-
-        # 4. Perform Checks
+        # Note: Unix timestamps are timezone independent, so they compare directly
+        (date_sig, hash_sig), (date_doc, _), (date_body, hash_body) = sig, doc, body
 
         # Condition A: If the body was updated, and the signature and docstring were not updated afterward
         # Logic: Body Date > Signature Date AND Body Date > Docstring Date
         if date_body > date_sig and date_body > date_doc:
             warnings.append(
                 f"Check the docstring or function, as the body was updated. "
-                f"(Body commit: {hash_sig})"
+                f"(Body commit: {hash_body})"
             )
 
         # Condition B: If the signature was updated, and the docstring was not updated afterward
@@ -359,22 +177,59 @@ class CodeInspector:
 
         return warnings
 
+    def check_function_consistency(self, name: str) -> List[str]:
+        """
+        Compares the latest Git commits for Signature, Docstring, and Body.
+        Returns a list of warning notes if inconsistencies are found.
+        """
+        return self.check_many([name])[0]
+
+    def check_many(self, names: List[str]) -> List[List[str]]:
+        """
+        Runs the consistency check for several names.
+        Returns one list of warning notes per name, in the same order.
+        """
+        if not names:
+            return []
+
+        # 1. Get latest dates and hashes for every section of every name.
+        # Each section is one blocking git process, so they all share one thread pool.
+        sections = []
+        for name in names:
+            sections += [self.get_signature_lines(name), self.get_docstring_lines(name), self._get_body_lines(name)]
+        with ThreadPoolExecutor(max_workers=min(len(sections), _MAX_GIT_WORKERS)) as executor:
+            latest = list(executor.map(self._latest_commit_for_ranges, sections))
+
+        # 2. Perform Checks, one (signature, docstring, body) triple per name
+        return [self._consistency_warnings(*latest[i:i + 3]) for i in range(0, len(latest), 3)]
+
+    def batch_check(self, names: Iterable[str]) -> Dict[str, List[str]]:
+        """
+        Runs the consistency check for several names on this one inspector,
+        reusing its parsed tree, name index and caches instead of creating an inspector per name.
+        Returns {name: warning notes}.
+        """
+        names = list(names)
+        return dict(zip(names, self.check_many(names)))
+
 def main():
     target_file = os.path.abspath(__file__) # Analyze this file itself
-    target_func = "check_function_consistency"
+    target_funcs = ["check_function_consistency", "check_many", "batch_check"]
 
     try:
+        # One inspector serves every query on the file
         inspector = CodeInspector(target_file)
+        results = inspector.batch_check(target_funcs)
 
-        print(f"--- Analyzing Consistency for '{target_func}' ---\n")
-
-        notes = inspector.check_function_consistency(target_func)
+        for target_func, notes in results.items():
+            print(f"--- Analyzing Consistency for '{target_func}' ---\n")
 
-        if notes:
-            for note in notes:
-                print(f"[!] {note}")
-        else:
-            print("[+] No inconsistencies found in commit history.")
+            if notes:
+                for note in notes:
+                    print(f"[!] {note}")
+            else:
+                print("[+] No inconsistencies found in commit history.")
+            print()
 
     except Exception as e:
         print(f"Error: {e}")
@@ -0,0 +1,7 @@
+from .base_inspector import _BaseInspector
+
+class DocstringInspector(_BaseInspector):
+    """
+    Finds the signature, docstring and body lines of a definition and their git history.
+    Use CodeInspector to also check them for consistency.
+    """